@@ -0,0 +1,20 @@
+import time
+
+from django.core.cache import cache
+
+POSTS_CACHE_TIMEOUT = 30
+POSTS_CACHE_VERSION_KEY = 'blog:posts_cache_version'
+
+
+def get_posts_cache_prefix():
+    """Префикс ключей закэшированных страниц с лентами публикаций."""
+    version = cache.get_or_set(POSTS_CACHE_VERSION_KEY, 0, None)
+    return f'blog.posts.{version}'
+
+
+def invalidate_posts_cache():
+    """Сбрасывает закэшированные ленты, меняя префикс их ключей."""
+    try:
+        cache.incr(POSTS_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(POSTS_CACHE_VERSION_KEY, time.time_ns(), None)
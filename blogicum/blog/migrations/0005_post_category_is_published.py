@@ -0,0 +1,37 @@
+# Generated by Django 3.2.16 on 2026-10-14 05:09
+
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def fill_category_is_published(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.filter(
+        Q(category__isnull=True) | Q(category__is_published=False)
+    ).update(category_is_published=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_post_category_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_published_pub_date_idx',
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='category_is_published',
+            field=models.BooleanField(default=True, editable=False, verbose_name='Категория опубликована'),
+        ),
+        migrations.RunPython(
+            fill_category_is_published, migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['is_published', 'category_is_published', '-pub_date'], name='post_published_pub_date_idx'),
+        ),
+    ]
@@ -24,6 +24,10 @@ class Category(BaseModel):
     class Meta:
         verbose_name = 'категория'
         verbose_name_plural = 'Категории'
+        indexes = [
+            models.Index(fields=['slug', 'is_published'],
+                         name='category_slug_published_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -72,15 +76,49 @@ class Post(BaseModel):
         upload_to='blogs_images', null=True, blank=True,
         verbose_name='Фото'
     )
+    # Копия category.is_published, чтобы ленты фильтровались
+    # по одной таблице. Поддерживается сигналами из blog.signals.
+    category_is_published = models.BooleanField(
+        default=True, editable=False,
+        verbose_name='Категория опубликована'
+    )
+    # Число комментариев для карточек в лентах, чтобы не считать
+    # их при каждом запросе. Карточки выводят только это число,
+    # поэтому сами комментарии в лентах не загружаются.
+    # Поддерживается сигналами из blog.signals.
+    comment_count = models.PositiveIntegerField(
+        default=0, editable=False,
+        verbose_name='Количество комментариев'
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         default_related_name = 'posts'
+        indexes = [
+            models.Index(
+                fields=['is_published', 'category_is_published', '-pub_date'],
+                name='post_published_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # Счётчик меняется только атомарными UPDATE из сигналов:
+        # обычное сохранение записало бы устаревшее значение.
+        if (self.pk is not None and not self._state.adding
+                and kwargs.get('update_fields') is None):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name != 'comment_count'
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     author = models.ForeignKey(
@@ -94,5 +132,11 @@ class Comment(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['post', 'created_at'],
+                         name='comment_post_created_idx'),
+        ]
+
     def __str__(self):
         return self.text
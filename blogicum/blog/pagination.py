@@ -0,0 +1,115 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+
+NEXT = 'n'
+PREVIOUS = 'p'
+# Наибольшее значение BigAutoField.
+MAX_PK = 2 ** 63 - 1
+
+
+class CursorPage:
+    """Страница keyset-пагинации с курсорами на соседние страницы."""
+
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset-пагинация по убыванию поля ``field`` и первичного ключа.
+
+    Вместо OFFSET страница выбирается условием на значения последней
+    показанной записи, поэтому стоимость не растёт с глубиной.
+    ``field`` должен быть DateTimeField: в курсоре значение хранится
+    в формате ISO 8601 с часовым поясом.
+    """
+
+    def __init__(self, queryset, per_page, field='pub_date'):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+
+    def encode_cursor(self, obj, direction):
+        value = getattr(obj, self.field).isoformat()
+        raw = f'{direction}|{value}|{obj.pk}'.encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            direction, value, pk = raw.split('|')
+            value = datetime.fromisoformat(value)
+            pk = int(pk)
+        except (binascii.Error, UnicodeError, ValueError):
+            raise InvalidPage('Некорректный курсор')
+        if (direction not in (NEXT, PREVIOUS)
+                or value.tzinfo is None
+                or not 0 < pk <= MAX_PK):
+            raise InvalidPage('Некорректный курсор')
+        return direction, value, pk
+
+    def page(self, cursor=None):
+        field = self.field
+        if cursor is None:
+            direction = NEXT
+            queryset = self.queryset
+        else:
+            direction, value, pk = self.decode_cursor(cursor)
+            if direction == NEXT:
+                queryset = self.queryset.filter(
+                    Q(**{f'{field}__lt': value})
+                    | Q(**{field: value, 'pk__lt': pk})
+                )
+            else:
+                queryset = self.queryset.filter(
+                    Q(**{f'{field}__gt': value})
+                    | Q(**{field: value, 'pk__gt': pk})
+                )
+
+        if direction == NEXT:
+            rows = list(
+                queryset.order_by(f'-{field}', '-pk')[:self.per_page + 1]
+            )
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            next_cursor = (
+                self.encode_cursor(rows[-1], NEXT) if has_more else None
+            )
+            previous_cursor = (
+                self.encode_cursor(rows[0], PREVIOUS)
+                if cursor is not None and rows else None
+            )
+        else:
+            rows = list(
+                queryset.order_by(field, 'pk')[:self.per_page + 1]
+            )
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            previous_cursor = (
+                self.encode_cursor(rows[0], PREVIOUS) if has_more else None
+            )
+            next_cursor = self.encode_cursor(rows[-1], NEXT) if rows else None
+        return CursorPage(rows, next_cursor, previous_cursor)
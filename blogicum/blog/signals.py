@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+
+from .cache import invalidate_posts_cache
+from .models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+
+@receiver(pre_save, sender=Post)
+def copy_category_is_published(instance, **kwargs):
+    instance.category_is_published = (
+        instance.category is not None and instance.category.is_published
+    )
+
+
+@receiver(post_save, sender=Category)
+def sync_category_is_published(instance, **kwargs):
+    Post.objects.filter(category=instance).exclude(
+        category_is_published=instance.is_published
+    ).update(category_is_published=instance.is_published)
+
+
+@receiver(pre_delete, sender=Category)
+def unpublish_category_posts(instance, **kwargs):
+    # Посты удалённой категории остаются без неё (SET_NULL)
+    # и пропадают из лент так же, как при снятии её с публикации.
+    Post.objects.filter(category=instance).update(category_is_published=False)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(instance, created, **kwargs):
+    if created and instance.post_id is not None:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(instance, **kwargs):
+    # При каскадном удалении поста здесь выполняется по одному UPDATE
+    # на комментарий: в Django 3.2 сигнал не сообщает, что пост тоже
+    # удаляется, а дополнительный запрос на проверку не дешевле.
+    if instance.post_id is not None:
+        Post.objects.filter(
+            pk=instance.post_id, comment_count__gt=0
+        ).update(comment_count=F('comment_count') - 1)
+
+
+# Приёмники ниже регистрируются последними, а кэш сбрасывается после
+# фиксации транзакции. Иначе запрос, пришедший до обновления счётчиков
+# и флагов выше, сохранил бы старые данные под новым префиксом ключа.
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def reset_posts_cache(**kwargs):
+    transaction.on_commit(invalidate_posts_cache)
+
+
+@receiver(pre_save, sender=User)
+def detect_username_change(instance, update_fields=None, **kwargs):
+    # Из полей пользователя карточки выводят только имя пользователя,
+    # поэтому, например, обновление last_login при входе кэш не сбрасывает.
+    if instance.pk is None or (
+        update_fields is not None and 'username' not in update_fields
+    ):
+        instance._username_changed = False
+        return
+    old_username = User.objects.filter(pk=instance.pk).values_list(
+        'username', flat=True
+    ).first()
+    instance._username_changed = old_username != instance.username
+
+
+@receiver(post_save, sender=User)
+def reset_posts_cache_on_rename(instance, **kwargs):
+    if getattr(instance, '_username_changed', False):
+        transaction.on_commit(invalidate_posts_cache)
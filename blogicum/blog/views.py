@@ -1,20 +1,81 @@
+from functools import lru_cache
+
 from django.shortcuts import get_object_or_404, redirect
 from django.http import Http404
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.models import User
+from django.core.paginator import InvalidPage, Paginator
 from django.utils import timezone
-from django.core.exceptions import PermissionDenied
-from django.db.models import Count
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.urls import reverse_lazy, reverse
 from django.views.generic import (ListView, CreateView,
                                   UpdateView, DeleteView,
                                   DetailView)
 
+from core.mixins import AnonymousCachePageMixin
+from .cache import POSTS_CACHE_TIMEOUT, get_posts_cache_prefix
 from .forms import CommentForm, PostForm, UserProfileForm
 from .models import Post, Category, Comment
+from .pagination import CursorPaginator
+
+COMMENTS_PER_PAGE = 20
+# Поля, которые выводит карточка поста в лентах.
+POST_CARD_FIELDS = (
+    'title', 'text', 'pub_date', 'image', 'is_published',
+    'author', 'author__username',
+    'category', 'category__title', 'category__slug',
+    'category__is_published',
+    'location', 'location__name', 'location__is_published',
+    'comment_count',
+)
+# Поля автора, которые выводит страница профиля.
+PROFILE_FIELDS = (
+    'author__first_name', 'author__last_name',
+    'author__date_joined', 'author__is_staff',
+)
+
+
+@lru_cache(maxsize=1024)
+def profile_url(username):
+    return reverse('blog:profile', args=[username])
+
+
+@lru_cache(maxsize=1024)
+def post_detail_url(post_id):
+    return reverse('blog:post_detail', args=[post_id])
+
+
+def comment_page_url(comment):
+    """Адрес страницы поста, на которой выводится комментарий."""
+    position = Comment.objects.filter(post_id=comment.post_id).filter(
+        Q(created_at__lt=comment.created_at)
+        | Q(created_at=comment.created_at, pk__lt=comment.pk)
+    ).count()
+    page = position // COMMENTS_PER_PAGE + 1
+    url = post_detail_url(comment.post_id)
+    if page > 1:
+        url += f'?page={page}'
+    return f'{url}#comment_{comment.pk}'
+
 
+def truncated_now():
+    """Текущее время, округлённое вниз до минуты.
 
-class PostListView(ListView):
+    Одинаковое в пределах минуты значение даёт одинаковый SQL,
+    поэтому повторные запросы лент попадают в кэш.
+    """
+    return timezone.now().replace(second=0, microsecond=0)
+
+
+class PostFeedCacheMixin(AnonymousCachePageMixin):
+    cache_timeout = POSTS_CACHE_TIMEOUT
+
+    def get_cache_key_prefix(self):
+        return get_posts_cache_prefix()
+
+
+class PostListView(PostFeedCacheMixin, ListView):
     model = Post
     paginate_by = 10
     template_name = 'blog/index.html'
@@ -22,10 +83,18 @@ class PostListView(ListView):
     def get_queryset(self):
         return Post.objects.filter(
             is_published=True,
-            pub_date__lte=timezone.now(),
-            category__is_published=True
-        ).select_related('author').prefetch_related('category', 'location')\
-         .annotate(comment_count=Count('comments')).order_by('-pub_date')
+            pub_date__lte=truncated_now(),
+            category_is_published=True
+        ).select_related('author', 'category', 'location')\
+         .only(*POST_CARD_FIELDS).order_by('-pub_date')
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidPage:
+            raise Http404('Страница не найдена')
+        return paginator, page, page.object_list, page.has_other_pages()
 
 
 class PostCreateView(LoginRequiredMixin, CreateView):
@@ -39,7 +108,7 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
     def get_success_url(self):
-        return reverse('blog:profile', args=[self.request.user.username])
+        return profile_url(self.request.user.username)
 
 
 class PostUpdateView(LoginRequiredMixin, UpdateView):
@@ -47,14 +116,21 @@ class PostUpdateView(LoginRequiredMixin, UpdateView):
     form_class = PostForm
     template_name = 'blog/create.html'
 
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            author=self.request.user
+        ).select_related('category', 'author', 'location')
+
     def dispatch(self, request, *args, **kwargs):
-        self.object = self.get_object()
-        if self.object.author != request.user:
-            return redirect('blog:post_detail', post_id=self.object.pk)
-        return super().dispatch(request, *args, **kwargs)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except Http404:
+            if not Post.objects.filter(pk=kwargs['pk']).exists():
+                raise
+            return redirect('blog:post_detail', post_id=kwargs['pk'])
 
     def get_success_url(self):
-        return reverse('blog:post_detail', kwargs={'post_id': self.object.pk})
+        return post_detail_url(self.object.pk)
 
 
 class PostDeleteView(LoginRequiredMixin, DeleteView):
@@ -72,20 +148,30 @@ class PostDetailView(DetailView):
     template_name = 'blog/detail.html'
 
     def get_object(self, queryset=None):
-        post = get_object_or_404(Post, id=self.kwargs['post_id'])
-        if post.author == self.request.user or (
+        post = get_object_or_404(
+            Post.objects.select_related('category', 'author', 'location'),
+            id=self.kwargs['post_id']
+        )
+        if post.author_id == self.request.user.id or (
             post.is_published
-            and post.category.is_published
-            and post.pub_date <= timezone.now()
+            and post.category_is_published
+            and post.pub_date <= truncated_now()
         ):
             return post
         raise Http404('Страница не найдена')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        comments = self.object.comments.select_related(
+            'author'
+        ).order_by('created_at', 'pk')
+        page_obj = Paginator(comments, COMMENTS_PER_PAGE).get_page(
+            self.request.GET.get('page')
+        )
         context.update({
             'form': CommentForm(),
-            'comments': self.object.comments.order_by('created_at')
+            'comments': page_obj,
+            'page_obj': page_obj
         })
         return context
 
@@ -96,21 +182,27 @@ class ProfileView(ListView):
     paginate_by = 10
 
     def get_queryset(self):
-        self.profile = get_object_or_404(User,
-                                         username=self.kwargs['username'])
-        return Post.objects.filter(author=self.profile).select_related(
+        return Post.objects.filter(
+            author__username=self.kwargs['username']
+        ).select_related(
             'author', 'category', 'location'
-        ).prefetch_related('comments').annotate(
-            comment_count=Count('comments')
-        ).order_by('-pub_date')
+        ).only(*POST_CARD_FIELDS, *PROFILE_FIELDS).order_by('-pub_date')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['profile'] = self.profile
+        page_obj = context['page_obj']
+        # Автор уже получен вместе с постами, отдельный запрос нужен
+        # только для пользователей без публикаций.
+        if len(page_obj):
+            context['profile'] = page_obj[0].author
+        else:
+            context['profile'] = get_object_or_404(
+                User, username=self.kwargs['username']
+            )
         return context
 
 
-class CategoryPostsView(ListView):
+class CategoryPostsView(PostFeedCacheMixin, ListView):
     model = Post
     paginate_by = 10
     template_name = 'blog/category.html'
@@ -122,10 +214,10 @@ class CategoryPostsView(ListView):
         return Post.objects.filter(
             category=self.category,
             is_published=True,
-            pub_date__lte=timezone.now(),
-            category__is_published=True
+            pub_date__lte=truncated_now(),
+            category_is_published=True
         ).select_related('author', 'category', 'location')\
-         .annotate(comment_count=Count('comments')).order_by('-pub_date')
+         .only(*POST_CARD_FIELDS).order_by('-pub_date')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -142,8 +234,7 @@ class EditProfileView(LoginRequiredMixin, UpdateView):
         return self.request.user
 
     def get_success_url(self):
-        return reverse('blog:profile', kwargs={'username':
-                                               self.object.username})
+        return profile_url(self.object.username)
 
 
 class AddCommentView(LoginRequiredMixin, CreateView):
@@ -152,30 +243,38 @@ class AddCommentView(LoginRequiredMixin, CreateView):
     template_name = 'comments.html'
 
     def form_valid(self, form):
+        try:
+            post_id = int(self.kwargs['post_id'])
+        except ValueError:
+            raise Http404('Страница не найдена')
         form.instance.author = self.request.user
-        form.instance.post = get_object_or_404(Post, id=self.kwargs['post_id'])
-        return super().form_valid(form)
+        form.instance.post_id = post_id
+        if transaction.get_connection().in_atomic_block:
+            # Внутри внешней транзакции (например, ATOMIC_REQUESTS)
+            # отложенный внешний ключ проверится только при её фиксации,
+            # поэтому существование поста проверяется явно.
+            if not Post.objects.filter(pk=post_id).exists():
+                raise Http404('Страница не найдена')
+            return super().form_valid(form)
+        # Существование поста проверяет внешний ключ при вставке.
+        try:
+            with transaction.atomic():
+                return super().form_valid(form)
+        except IntegrityError:
+            raise Http404('Страница не найдена')
 
     def get_success_url(self):
-        return reverse('blog:post_detail', kwargs={'post_id':
-                                                   self.kwargs['post_id']})
+        return comment_page_url(self.object)
 
 
 class EditCommentView(LoginRequiredMixin, UpdateView):
     model = Comment
     form_class = CommentForm
     template_name = 'blog/comment.html'
+    pk_url_kwarg = 'comment_id'
 
-    def dispatch(self, request, *args, **kwargs):
-        self.object = self.get_object()
-        if self.object.author != request.user:
-            raise PermissionDenied(
-                'Вы не авторизованы для редактирования этого комментария.'
-            )
-        return super().dispatch(request, *args, **kwargs)
-
-    def get_object(self):
-        return get_object_or_404(Comment, id=self.kwargs['comment_id'])
+    def get_queryset(self):
+        return super().get_queryset().filter(author=self.request.user)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -183,8 +282,7 @@ class EditCommentView(LoginRequiredMixin, UpdateView):
         return context
 
     def get_success_url(self):
-        return reverse('blog:post_detail', kwargs={'post_id':
-                                                   self.kwargs['post_id']})
+        return comment_page_url(self.object)
 
 
 class DeleteCommentView(LoginRequiredMixin, DeleteView):
@@ -192,17 +290,8 @@ class DeleteCommentView(LoginRequiredMixin, DeleteView):
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
 
-    def dispatch(self, request, *args, **kwargs):
-        self.object = self.get_object()
-        if self.object.author != request.user:
-            raise PermissionDenied(
-                'Вы не авторизованы для удаления этого комментария.'
-            )
-        return super().dispatch(request, *args, **kwargs)
+    def get_queryset(self):
+        return super().get_queryset().filter(author=self.request.user)
 
     def get_success_url(self):
-        return reverse('blog:post_detail', kwargs={'post_id':
-                                                   self.kwargs['post_id']})
-
-    def post(self, request, *args, **kwargs):
-        return self.delete(request, *args, **kwargs)
+        return post_detail_url(self.kwargs['post_id'])
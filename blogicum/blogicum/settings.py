@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django_bootstrap5',
+    'cachalot',
     'pages',
     'blog'
 ]
@@ -86,6 +87,38 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+# LocMemCache хранит данные в памяти одного процесса: при нескольких
+# воркерах запись в одном из них не сбрасывает кэш остальных.
+# В продакшене нужен общий бэкенд (Redis, Memcached).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Отдельный кэш для результатов запросов, чтобы они не вытесняли
+    # страницы и ключ версии лент из 'default'.
+    'cachalot': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'cachalot',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+CACHALOT_CACHE = 'cachalot'
+# С кэшем в памяти процесса ограничиваем время жизни результатов
+# запросов, как и у кэша страниц; для общего бэкенда можно задать None.
+CACHALOT_TIMEOUT = 30
+# Сессии и пользователи не кэшируются: иначе выход, смена пароля
+# или блокировка в одном процессе не были бы видны в остальных.
+CACHALOT_UNCACHABLE_TABLES = frozenset((
+    'django_migrations',
+    'django_session',
+    'auth_user',
+))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -133,8 +166,12 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static'
 ]
 
+MEDIA_URL = '/media/'
+
 MEDIA_ROOT = BASE_DIR / 'media'
 
+LOGIN_URL = 'login'
+
 CSRF_FAILURE_VIEW = 'pages.views.error_403_view'
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
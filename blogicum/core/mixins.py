@@ -0,0 +1,22 @@
+from django.views.decorators.cache import cache_page
+
+
+class AnonymousCachePageMixin:
+    """Кэширует страницу целиком для анонимных посетителей.
+
+    Страницы аутентифицированных пользователей не кэшируются:
+    в шапке выводится имя текущего пользователя.
+    """
+
+    cache_timeout = None
+    cache_key_prefix = None
+
+    def get_cache_key_prefix(self):
+        return self.cache_key_prefix
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        return cache_page(
+            self.cache_timeout, key_prefix=self.get_cache_key_prefix()
+        )(super().dispatch)(request, *args, **kwargs)
@@ -1,22 +1,38 @@
+from functools import lru_cache
+
+from django.http import HttpResponse
 from django.shortcuts import render
+from django.template.loader import render_to_string
 from django.views.generic import TemplateView
 
+from core.mixins import AnonymousCachePageMixin
+
+STATIC_PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+@lru_cache(maxsize=None)
+def render_static_page(template_name):
+    """Рендерит шаблон без запроса один раз и запоминает результат."""
+    return render_to_string(template_name)
+
 
 def error_404_view(request, exception):
     return render(request, 'pages/404.html', status=404)
 
 
 def error_403_view(request, reason=''):
-    return render(request, 'pages/403csrf.html', status=403)
+    return HttpResponse(render_static_page('pages/403csrf.html'), status=403)
 
 
 def error_500_view(request):
-    return render(request, 'pages/500.html', status=500)
+    return HttpResponse(render_static_page('pages/500.html'), status=500)
 
 
-class AboutView(TemplateView):
+class AboutView(AnonymousCachePageMixin, TemplateView):
     template_name = 'pages/about.html'
+    cache_timeout = STATIC_PAGE_CACHE_TIMEOUT
 
 
-class RulesView(TemplateView):
+class RulesView(AnonymousCachePageMixin, TemplateView):
     template_name = 'pages/rules.html'
+    cache_timeout = STATIC_PAGE_CACHE_TIMEOUT
@@ -298,3 +298,73 @@ def test_404_on_comment_deleted_post(
         ),
         assert_created=False,
     )
+
+
+@pytest.mark.django_db
+def test_404_on_comment_to_missing_post_in_transaction(
+        user_client: django.test.Client,
+        CommentModel: Type[Model],
+):
+    # Тест выполняется внутри транзакции, как при ATOMIC_REQUESTS.
+    response = user_client.post(
+        "/posts/999999/comment/", data={"text": "Comment text"}
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что при попытке создания комментария "
+        "к несуществующему посту возвращается статус 404."
+    )
+    assert not CommentModel.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_404_on_comment_to_missing_post(
+        user_client: django.test.Client,
+        post_with_published_location: Any,
+        CommentModel: Type[Model],
+):
+    # Без внешней транзакции несуществующий пост отсекает внешний ключ.
+    post = post_with_published_location
+    comment_count = type(post).objects.get(pk=post.pk).comment_count
+    for url in ("/posts/999999/comment/", "/posts/abc/comment/"):
+        response = user_client.post(url, data={"text": "Comment text"})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            "Убедитесь, что при попытке создания комментария "
+            "к несуществующему посту возвращается статус 404."
+        )
+    assert not CommentModel.objects.exists()
+    assert type(post).objects.get(pk=post.pk).comment_count == comment_count
+
+
+@pytest.mark.django_db
+def test_comment_redirects_to_its_page(
+        mixer,
+        user: Model,
+        user_client: django.test.Client,
+        post_with_published_location: Any,
+        CommentModel: Type[Model],
+):
+    post = post_with_published_location
+    first_comment = mixer.blend(
+        "blog.Comment", post=post, author=user, text="First comment"
+    )
+    mixer.cycle(20).blend("blog.Comment", post=post, author=user)
+
+    response = user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Newest comment text"}
+    )
+    new_comment = CommentModel.objects.latest("pk")
+    assert response.status_code == HTTPStatus.FOUND
+    assert response.url == (
+        f"/posts/{post.id}/?page=2#comment_{new_comment.pk}"
+    ), (
+        "Убедитесь, что после добавления комментария пользователь попадает"
+        " на страницу поста, где выводится новый комментарий."
+    )
+    content = user_client.get(response.url).content.decode("utf-8")
+    assert "Newest comment text" in content
+
+    response = user_client.post(
+        f"/posts/{post.id}/edit_comment/{first_comment.id}/",
+        data={"text": "First comment edited"},
+    )
+    assert response.url == f"/posts/{post.id}/#comment_{first_comment.pk}"
@@ -0,0 +1,111 @@
+import base64
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+
+N_POSTS = 25
+
+
+def make_cursor(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+@pytest.fixture
+def posts_with_equal_pub_dates(mixer: Mixer, user, published_category):
+    # По три поста на каждую дату, чтобы границы страниц проходили
+    # внутри групп с одинаковым pub_date.
+    start = timezone.now() - timedelta(days=1)
+    pub_dates = (
+        start - timedelta(hours=i // 3) for i in range(N_POSTS)
+    )
+    return mixer.cycle(N_POSTS).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=None,
+        is_published=True,
+        pub_date=pub_dates,
+    )
+
+
+def get_page(client, cursor=None):
+    url = "/" if cursor is None else f"/?cursor={cursor}"
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return response.context["page_obj"]
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_walks_forward_and_back(
+        user_client, posts_with_equal_pub_dates
+):
+    expected_ids = [
+        post.pk for post in sorted(
+            posts_with_equal_pub_dates,
+            key=lambda post: (post.pub_date, post.pk),
+            reverse=True,
+        )
+    ]
+
+    pages = [get_page(user_client)]
+    assert not pages[0].has_previous()
+    while pages[-1].has_next():
+        pages.append(get_page(user_client, pages[-1].next_cursor))
+    assert [len(page) for page in pages] == [
+        N_PER_PAGE, N_PER_PAGE, N_POSTS - 2 * N_PER_PAGE
+    ]
+    assert [post.pk for page in pages for post in page] == expected_ids, (
+        "Убедитесь, что при переходе по страницам главной публикации"
+        " не повторяются и не пропадают, в том числе при одинаковых датах"
+        " публикации."
+    )
+
+    back_pages = [pages[-1]]
+    while back_pages[-1].has_previous():
+        back_pages.append(
+            get_page(user_client, back_pages[-1].previous_cursor)
+        )
+    assert [[post.pk for post in page] for page in back_pages] == [
+        [post.pk for post in page] for page in reversed(pages)
+    ]
+    assert back_pages[-1].has_next()
+    assert not back_pages[-1].has_previous()
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_single_page(
+        user_client, post_with_published_location
+):
+    page = get_page(user_client)
+    assert len(page) == 1
+    assert not page.has_other_pages()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "garbage",
+        make_cursor("n|not-a-date|1"),
+        make_cursor("x|2024-01-01T00:00:00+00:00|1"),
+        make_cursor("n|2024-01-01T00:00:00|1"),
+        make_cursor("n|2024-01-01T00:00:00+00:00|abc"),
+        make_cursor("n|2024-01-01T00:00:00+00:00|0"),
+        make_cursor("n|2024-01-01T00:00:00+00:00|-1"),
+        make_cursor(
+            "n|2024-01-01T00:00:00+00:00|1000000000000000000000000000000"
+        ),
+        make_cursor("n|2024-01-01T00:00:00+00:00"),
+    ],
+)
+def test_invalid_cursor_returns_404(user_client, cursor):
+    response = user_client.get(f"/?cursor={cursor}")
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что при некорректном курсоре пагинации главная страница"
+        " возвращает статус 404."
+    )
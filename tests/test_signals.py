@@ -0,0 +1,202 @@
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model
+from mixer.backend.django import Mixer
+
+from blog.cache import POSTS_CACHE_VERSION_KEY
+
+
+def get_comment_count(post: Model) -> int:
+    return type(post).objects.get(pk=post.pk).comment_count
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comments(
+        mixer: Mixer, user: Model, post_with_published_location: Model
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    assert get_comment_count(post) == 3, (
+        "Убедитесь, что при создании комментария счётчик комментариев поста"
+        " увеличивается."
+    )
+
+    comments[0].delete()
+    assert get_comment_count(post) == 2, (
+        "Убедитесь, что при удалении комментария счётчик комментариев поста"
+        " уменьшается."
+    )
+
+
+@pytest.mark.django_db
+def test_post_save_keeps_comment_count(
+        mixer: Mixer, user: Model, post_with_published_location: Model
+):
+    stale_post = type(post_with_published_location).objects.get(
+        pk=post_with_published_location.pk
+    )
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+
+    stale_post.title = "Edited title"
+    stale_post.save()
+    assert get_comment_count(stale_post) == 1, (
+        "Убедитесь, что сохранение поста не перезаписывает счётчик"
+        " комментариев, изменившийся после загрузки поста."
+    )
+
+    comment.delete()
+    assert get_comment_count(stale_post) == 0
+
+
+@pytest.mark.django_db
+def test_comment_count_never_negative(
+        mixer: Mixer, user: Model, post_with_published_location: Model
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    type(post).objects.filter(pk=post.pk).update(comment_count=0)
+
+    comment.delete()
+    assert get_comment_count(post) == 0
+
+
+@pytest.mark.django_db
+def test_edit_form_keeps_comment_count(
+        mixer: Mixer, user: Model, user_client,
+        post_with_published_location: Model
+):
+    post = post_with_published_location
+    mixer.blend("blog.Comment", post=post, author=user)
+    response = user_client.post(
+        f"/posts/{post.pk}/edit/",
+        data={
+            "title": "Edited title",
+            "text": post.text,
+            "pub_date": post.pub_date.strftime("%Y-%m-%dT%H:%M"),
+            "category": post.category_id,
+            "location": post.location_id,
+            "is_published": True,
+        },
+    )
+    assert response.status_code == 302
+    assert get_comment_count(post) == 1
+
+
+def get_feed_post_ids(client, url: str) -> set:
+    response = client.get(url)
+    if response.status_code != 200:
+        return set()
+    return {post.pk for post in response.context["page_obj"]}
+
+
+@pytest.mark.django_db
+def test_unpublished_category_hides_posts(
+        user_client, unlogged_client, post_with_published_location: Model,
+        django_capture_on_commit_callbacks
+):
+    post = post_with_published_location
+    category = post.category
+    category_url = f"/category/{category.slug}/"
+    assert post.pk in get_feed_post_ids(user_client, "/")
+    assert post.pk in get_feed_post_ids(user_client, category_url)
+    assert post.pk in get_feed_post_ids(unlogged_client, "/")
+
+    category.is_published = False
+    with django_capture_on_commit_callbacks(execute=True):
+        category.save()
+    for client in (user_client, unlogged_client):
+        assert post.pk not in get_feed_post_ids(client, "/"), (
+            "Убедитесь, что после снятия категории с публикации её посты"
+            " пропадают с главной страницы."
+        )
+    assert post.pk not in get_feed_post_ids(user_client, category_url)
+
+    category.is_published = True
+    category.save()
+    assert post.pk in get_feed_post_ids(user_client, "/"), (
+        "Убедитесь, что после возврата категории на публикацию её посты"
+        " снова видны на главной странице."
+    )
+
+
+@pytest.mark.django_db
+def test_deleted_category_hides_posts(
+        user_client, post_with_published_location: Model
+):
+    post = post_with_published_location
+    post.category.delete()
+    assert post.pk not in get_feed_post_ids(user_client, "/"), (
+        "Убедитесь, что посты удалённой категории не выводятся на главной"
+        " странице."
+    )
+
+
+@pytest.mark.django_db
+def test_post_moved_to_unpublished_category(
+        mixer: Mixer, user_client, post_with_published_location: Model
+):
+    post = post_with_published_location
+    post.category = mixer.blend("blog.Category", is_published=False)
+    post.save()
+    assert post.pk not in get_feed_post_ids(user_client, "/")
+
+
+def get_posts_cache_version():
+    return cache.get(POSTS_CACHE_VERSION_KEY)
+
+
+@pytest.mark.django_db
+def test_login_keeps_feed_cache(client, django_user_model):
+    django_user_model.objects.create_user(
+        username="login-user", password="password"
+    )
+    version = get_posts_cache_version()
+    assert client.login(username="login-user", password="password")
+    assert get_posts_cache_version() == version, (
+        "Убедитесь, что вход пользователя не сбрасывает кэш лент."
+    )
+
+
+@pytest.mark.django_db
+def test_username_change_resets_feed_cache(
+        user: Model, django_capture_on_commit_callbacks
+):
+    version = get_posts_cache_version()
+    with django_capture_on_commit_callbacks(execute=True):
+        user.first_name = "Unrendered"
+        user.save()
+    assert get_posts_cache_version() == version
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.username = "renamed-user"
+        user.save()
+    assert get_posts_cache_version() != version, (
+        "Убедитесь, что смена имени пользователя сбрасывает кэш лент."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_feed_cache_reset_after_commit(
+        mixer: Mixer, unlogged_client, post_with_published_location: Model
+):
+    post = post_with_published_location
+    assert post.pk in get_feed_post_ids(unlogged_client, "/")
+    version = get_posts_cache_version()
+    with transaction.atomic():
+        post.category.is_published = False
+        post.category.save()
+        assert get_posts_cache_version() == version, (
+            "Убедитесь, что кэш лент сбрасывается только после фиксации"
+            " транзакции."
+        )
+    assert get_posts_cache_version() != version
+    assert post.pk not in get_feed_post_ids(unlogged_client, "/")
+
+    mixer.blend("blog.Comment", post=post, author=post.author)
+    post.category.is_published = True
+    post.category.save()
+    content = unlogged_client.get("/").content.decode("utf-8")
+    assert "Комментарии (1)" in content